@@ -4,18 +4,21 @@ ESP32 Bluetooth & Serial Terminal
 Interactive terminal for ESP32-SD-WiFi device with dual monitoring
 
 Requirements:
-    pip install bleak textual
-    platformio (for serial monitoring)
+    pip install bleak textual pyserial
+    uvloop (faster event loop; installed by requirements.txt except on
+            Windows, and skipped automatically when missing)
 
 Usage:
-    python esp32_terminal.py [device_name]
+    python esp32_terminal.py [device_name] [serial_port]
     
     device_name: Optional Bluetooth device name (default: digicam-001)
+    serial_port: Optional USB serial port (default: auto-detect)
     
 Examples:
     python esp32_terminal.py                    # Connect to digicam-001
     python esp32_terminal.py ESP32-SD-WiFi      # Connect to ESP32-SD-WiFi
     python esp32_terminal.py my-device          # Connect to my-device
+    python esp32_terminal.py digicam-001 /dev/ttyUSB0
 
 Commands:
     HELP                              - Show available commands
@@ -30,16 +33,29 @@ Commands:
 """
 
 import asyncio
+import json
+import os
 import sys
-import subprocess
-import threading
-from datetime import datetime
+import time
 from collections import deque
 from bleak import BleakClient, BleakScanner
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Header, Footer, Static, Input, RichLog
 from textual.binding import Binding
+from rich.markup import escape
+from rich.text import Text
+
+try:
+    import serial
+    from serial.tools import list_ports
+except ImportError:
+    serial = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # BLE UART Service UUIDs
 SERVICE_UUID = "6E400001-B5A3-F393-E0A9-E50E24DCCA9E"
@@ -50,6 +66,77 @@ TX_UUID = "6E400003-B5A3-F393-E0A9-E50E24DCCA9E"  # Receive from ESP32
 DEFAULT_DEVICE_NAME = "digicam-001"
 DEFAULT_BAUD_RATE = 115200
 MAX_LOG_LINES = 500
+# USB vendor IDs of the USB-UART bridges found on ESP32 boards:
+# Silicon Labs CP210x, WCH CH34x, FTDI, Espressif native USB
+ESP32_USB_VIDS = frozenset((0x10C4, 0x1A86, 0x0403, 0x303A))
+TYPING_IDLE_SECONDS = 3.0  # resume log auto-scroll after this much idle input
+TYPING_PAUSE_SECONDS = 0.3  # hold log writes until input has been quiet this long
+MAX_RENDER_DEFER = 1.0  # ...but never hold a pending batch longer than this
+
+# Input words that exit the app
+_QUIT = frozenset(('quit', 'exit', 'q'))
+
+# Upper bound on how long send_command waits for the device to start
+# replying, by first command word (WIFI SCAN blocks ~3s on the device)
+_RESPONSE_TIMEOUTS = {"WAKE": 3.0, "WIFI": 3.0, "STATUS": 1.0}
+DEFAULT_RESPONSE_TIMEOUT = 0.5
+
+
+def _response_timeout(key):
+    """Reply wait ceiling for a stripped, upper-cased command"""
+    return _RESPONSE_TIMEOUTS.get(key.split(' ', 1)[0], DEFAULT_RESPONSE_TIMEOUT)
+
+
+def _find_serial_port():
+    """First serial port that looks like an ESP32 USB-UART bridge, or None"""
+    for port in list_ports.comports():
+        if port.vid in ESP32_USB_VIDS:
+            return port.device
+    return None
+
+
+# Last known address per device name, so restarts can skip the scan
+ADDRESS_CACHE_PATH = os.path.expanduser("~/.esp32_terminal_cache")
+CACHED_CONNECT_TIMEOUT = 5.0
+
+
+def _load_cached_address(device_name):
+    """Address saved for device_name by a previous run, or None"""
+    try:
+        with open(ADDRESS_CACHE_PATH) as f:
+            return json.load(f).get(device_name)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _save_cached_address(device_name, address):
+    """Remember device_name's address for the next run"""
+    try:
+        with open(ADDRESS_CACHE_PATH) as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    cache[device_name] = address
+    try:
+        with open(ADDRESS_CACHE_PATH, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+# Built-in firmware commands -> (encoded payload, reply wait ceiling).
+# The firmware trims and upper-cases input, so the canonical bytes are safe
+# to send for any spelling of these.
+_CMD_TABLE = {
+    cmd: (cmd.encode('utf-8'), _response_timeout(cmd)) for cmd in (
+        "HELP", "STATUS", "QUEUE", "QUEUE UPDATE", "QUEUE RESET",
+        "SD ON", "SD OFF", "SD STATUS", "SD LIST",
+        "SLEEP", "WAKE", "RESTART",
+        "WIFI ON", "WIFI OFF", "WIFI SCAN", "WIFI AP",
+    )
+}
 
 class ESP32Terminal(App):
     """Textual app for ESP32 terminal"""
@@ -79,16 +166,27 @@ class ESP32Terminal(App):
         Binding("ctrl+c", "quit", "Quit"),
     ]
     
-    def __init__(self, device_name=DEFAULT_DEVICE_NAME):
+    def __init__(self, device_name=DEFAULT_DEVICE_NAME, serial_port=None):
         super().__init__()
         # Bluetooth
         self.client = None
         self.bt_connected = False
         self.device_name = device_name
+        # Write-without-response by default; replies arrive as notifications
+        self.require_response = False
+        # Largest single-PDU write (ATT MTU - 3); updated after connect
+        self.mtu_payload = 20
+        # One command in flight at a time; _resp_event is set by the
+        # notification handler when data arrives while _awaiting_reply
+        self._send_lock = asyncio.Lock()
+        self._resp_event = asyncio.Event()
+        self._awaiting_reply = False
         
-        # Serial (via platformio)
-        self.serial_process = None
+        # Serial (USB port read directly with pyserial)
+        self.serial_port = serial_port
+        self.serial_conn = None
         self.serial_connected = False
+        self._serial_tail = b''
         
         # UI state
         self.running = False
@@ -96,17 +194,34 @@ class ESP32Terminal(App):
         self.serial_log_widget = None
         self.input_widget = None
         
-        # Message queues for thread-safe logging (with max size to prevent unbounded growth)
-        self.bt_message_queue = asyncio.Queue(maxsize=100)
-        self.serial_message_queue = asyncio.Queue(maxsize=200)
+        # Ring buffers filled by the BLE callback / serial pump and drained by
+        # process_bt_messages / process_serial_messages. A single deque append
+        # or popleft is atomic under the GIL, so no lock is needed.
+        self.bt_buf = deque(maxlen=200)
+        self.serial_buf = deque(maxlen=200)
+        
+        # Set once per batch by the notification handler to wake the BT drain
+        self._bt_evt = asyncio.Event()
+        self._bt_pending = False
+        # Set by the serial pump whenever it queues lines
+        self._serial_evt = asyncio.Event()
+        
+        # Consecutive identical BT lines are counted instead of re-rendered
+        self._last_bt_line = None
+        self._bt_repeat = 0
+        self._bt_repeat_due = False
         
-        # Buffers for periodic updates (reduces render frequency)
-        self.bt_buffer = []
-        self.serial_buffer = []
+        # Cached "%H:%M:%S" string and BT log prefix, recomputed only when
+        # the second changes
+        self._ts_sec = 0
+        self._ts_str = ""
+        self._ts_prefix = ""
         
         # Track user activity to pause rendering
         self.user_typing = False
         self.last_input_time = 0
+        # Set on submit to cut short any flush being held for typing
+        self._typing_ended = asyncio.Event()
         
     def compose(self) -> ComposeResult:
         """Create child widgets"""
@@ -130,85 +245,188 @@ class ESP32Terminal(App):
         
         self.input_widget.focus()
         
-        # Get event loop for thread-safe operations
-        self.loop = asyncio.get_event_loop()
+        # Cache the running loop once; the BLE callback uses it to signal the drain
+        self.loop = asyncio.get_running_loop()
         
         # Start connections
         self.running = True
         asyncio.create_task(self.connect_devices())
         
-        # Start direct message processors (no buffers, no timers)
-        asyncio.create_task(self.process_bt_messages_direct())
-        asyncio.create_task(self.process_serial_messages_direct())
+        # Both logs drain on demand; serial coalesces bursts before rendering
+        asyncio.create_task(self.process_bt_messages())
+        asyncio.create_task(self.process_serial_messages())
+        self.set_interval(0.5, self.flush_bt_repeats)
+        self.set_interval(1.0, self._check_idle_scroll)
     
     async def connect_devices(self):
         """Connect to Bluetooth and start serial monitor"""
         await self.connect_bluetooth()
-        # DISABLE SERIAL FOR NOW - it's fundamentally incompatible with Textual
-        # self.start_serial_monitor()
-        self.serial_log_widget.write("[yellow]Serial monitoring disabled due to performance issues[/]")
-        self.serial_log_widget.write("[dim]Run 'platformio device monitor --baud 115200' in a separate terminal[/]")
         
         if self.bt_connected:
-            await self.send_command("HELP")
+            # Don't hold up the serial monitor waiting for the HELP reply
+            asyncio.create_task(self.send_command("HELP"))
+        
+        await self.start_serial_monitor()
+    
+    def _ts(self):
+        """Current time as HH:MM:SS, formatted at most once per second"""
+        s = int(time.time())
+        if s != self._ts_sec:
+            # Store the strings first so another thread never pairs the new
+            # second with the old strings
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(s))
+            self._ts_prefix = f"[dim]{self._ts_str}[/] "
+            self._ts_sec = s
+        return self._ts_str
+    
+    def _prefix(self):
+        """Markup timestamp prefix for BT log lines, cached per second"""
+        self._ts()
+        return self._ts_prefix
     
     def notification_handler(self, sender, data):
-        """Handle incoming data from ESP32 via Bluetooth"""
-        try:
-            message = data.decode('utf-8').rstrip('\n\r')
-            if message:
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                # Queue message for processing in main loop
-                asyncio.run_coroutine_threadsafe(
-                    self.bt_message_queue.put(f"[dim]{timestamp}[/] {message}"),
-                    self.loop
-                )
-        except UnicodeDecodeError:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            asyncio.run_coroutine_threadsafe(
-                self.bt_message_queue.put(f"[dim]{timestamp}[/] [yellow][Binary: {data.hex()}][/]"),
-                self.loop
-            )
+        """Handle incoming data from ESP32 via Bluetooth
+        
+        Runs on bleak's callback thread, so it only records the raw bytes;
+        decoding, formatting and rendering happen in process_bt_messages on
+        the UI loop, once per batch.
+        """
+        if data:
+            self.bt_buf.append((self._prefix(), data))
+            # Only the first message of a batch crosses into the event loop;
+            # the drain picks up anything appended before it clears the flag
+            if not self._bt_pending:
+                self._bt_pending = True
+                self.loop.call_soon_threadsafe(self._bt_evt.set)
+            # Release a waiting send_command as soon as its reply starts,
+            # independent of when the drain gets to render it
+            if self._awaiting_reply:
+                self._awaiting_reply = False
+                self.loop.call_soon_threadsafe(self._resp_event.set)
     
-    async def process_bt_messages_direct(self):
-        """Process BT messages with throttling"""
-        while self.running:
+    @staticmethod
+    def _decode_bt(data):
+        """Turn a raw notification payload into a log message"""
+        # Control bytes below TAB at the start mean a binary frame; only then
+        # is it worth paying for hex(). The handler never queues empty data.
+        if min(data[:4]) < 9:
+            return f"[yellow][Binary: {data.hex()}][/]"
+        # Device text goes into a markup log; escape it so SSIDs, filenames
+        # and the firmware's [WAKE]/[SCAN] prefixes aren't parsed as tags
+        return escape(data.decode('utf-8', 'replace').rstrip('\n\r'))
+    
+    async def _wait_for_typing_pause(self):
+        """Delay a log flush while keys are arriving, up to MAX_RENDER_DEFER"""
+        started = time.monotonic()
+        while True:
+            now = time.monotonic()
+            idle = now - self.last_input_time
+            waited = now - started
+            if idle >= TYPING_PAUSE_SECONDS or waited >= MAX_RENDER_DEFER:
+                return
+            self._typing_ended.clear()
             try:
-                message = await self.bt_message_queue.get()
-                self.bt_log_widget.write(message)
-                # Small delay to throttle
-                await asyncio.sleep(0.01)
-            except Exception:
+                await asyncio.wait_for(
+                    self._typing_ended.wait(),
+                    timeout=min(TYPING_PAUSE_SECONDS - idle, MAX_RENDER_DEFER - waited)
+                )
+            except asyncio.TimeoutError:
                 pass
     
-    async def process_serial_messages_direct(self):
-        """Process Serial messages with aggressive throttling"""
-        batch = []
+    async def process_bt_messages(self):
+        """Drain BT messages whenever the notification handler signals"""
         while self.running:
+            await self._bt_evt.wait()
+            await self._wait_for_typing_pause()
+            self._bt_evt.clear()
+            self._bt_pending = False
             try:
-                # Collect up to 20 messages
-                for _ in range(20):
-                    try:
-                        message = self.serial_message_queue.get_nowait()
-                        batch.append(message)
-                    except asyncio.QueueEmpty:
-                        break
-                
-                # Write batch if we have messages
-                if batch:
-                    for msg in batch:
-                        self.serial_log_widget.write(msg)
-                    batch = []
-                
-                # Wait longer between batches to reduce rendering
-                await asyncio.sleep(0.5)
-            except Exception:
-                pass
+                self.render_bt_buffer()
+            except Exception as e:
+                # One bad batch must not stop the BT pane for good
+                self.bt_log_widget.write(Text(f"Render error: {e}", style="red"))
+    
+    def render_bt_buffer(self) -> None:
+        """Write pending BT messages (and any due repeat count) to the log"""
+        messages = []
+        while self.bt_buf:
+            messages.append(self.bt_buf.popleft())
+        lines = []
+        for prefix, data in messages:
+            message = self._decode_bt(data)
+            if not message:
+                continue
+            if message == self._last_bt_line:
+                self._bt_repeat += 1
+                continue
+            if self._bt_repeat:
+                lines.append(self._bt_repeat_line())
+            self._last_bt_line = message
+            self._bt_repeat = 0
+            lines.append(prefix + message)
+        if self._bt_repeat_due:
+            self._bt_repeat_due = False
+            if self._bt_repeat:
+                lines.append(self._bt_repeat_line())
+        if lines:
+            # One write means one markup pass and one refresh for the whole batch
+            self.bt_log_widget.write("\n".join(lines))
+    
+    def _bt_repeat_line(self):
+        """Summary line for repeats of the last BT line; resets the count"""
+        times = "time" if self._bt_repeat == 1 else "times"
+        line = self._prefix() + f"{self._last_bt_line} [dim](repeated {self._bt_repeat} more {times})[/]"
+        self._bt_repeat = 0
+        return line
+    
+    def flush_bt_repeats(self) -> None:
+        """Have the BT drain show any pending repeat count
+        
+        Goes through process_bt_messages so it respects the typing hold.
+        """
+        if self._bt_repeat:
+            self._bt_repeat_due = True
+            self._bt_evt.set()
+    
+    async def process_serial_messages(self):
+        """Flush serial lines 100ms after the first arrives, or at 50 lines"""
+        while self.running:
+            await self._serial_evt.wait()
+            deadline = self.loop.time() + 0.1
+            while len(self.serial_buf) < 50 and self.loop.time() < deadline:
+                await asyncio.sleep(0.01)
+            await self._wait_for_typing_pause()
+            self._serial_evt.clear()
+            self.render_serial_buffer()
+    
+    def render_serial_buffer(self) -> None:
+        """Write pending Serial messages to the log"""
+        if not self.serial_buf:
+            return
+        messages = []
+        while self.serial_buf:
+            messages.append(self.serial_buf.popleft())
+        # One timestamp per batch; serial_log is plain text (markup=False),
+        # status lines written elsewhere pass pre-styled Text instead
+        self.serial_log_widget.write(f"{self._ts()} " + "\n".join(messages))
     
     async def connect_bluetooth(self):
-        """Scan for and connect to ESP32 device via Bluetooth"""
+        """Connect to ESP32 device via Bluetooth
+        
+        Tries the address cached by the last successful connect first, and
+        only falls back to a name scan if that fails.
+        """
+        address = _load_cached_address(self.device_name)
+        if address:
+            self.bt_log_widget.write(f"[yellow]Connecting to cached address {address}...[/]")
+            client = BleakClient(address, timeout=CACHED_CONNECT_TIMEOUT)
+            if await self._connect_client(client, quiet=True):
+                return True
+            self.bt_log_widget.write("[dim]Cached address unreachable, scanning...[/]")
+        
         self.bt_log_widget.write(f"[yellow]Scanning for '{self.device_name}'...[/]")
-        device = await BleakScanner.find_device_by_name(self.device_name, timeout=10.0)
+        # The device advertises at <=200ms intervals, so 5s is plenty
+        device = await BleakScanner.find_device_by_name(self.device_name, timeout=5.0)
         
         if not device:
             self.bt_log_widget.write(f"[red]❌ Device '{self.device_name}' not found![/]")
@@ -216,9 +434,34 @@ class ESP32Terminal(App):
         
         self.bt_log_widget.write(f"[green]✓ Found: {device.name} ({device.address})[/]")
         
+        if await self._connect_client(BleakClient(device)):
+            _save_cached_address(self.device_name, device.address)
+            return True
+        return False
+    
+    async def _connect_client(self, client, quiet=False):
+        """Connect, configure writes and subscribe to notifications
+        
+        With quiet=True a failure is not reported; the caller has a fallback.
+        """
         try:
-            self.client = BleakClient(device)
+            self.client = client
             await self.client.connect()
+            # BlueZ reports the default 23-byte MTU until it is explicitly
+            # acquired; other backends exchange MTU during connect
+            acquire_mtu = getattr(self.client._backend, "_acquire_mtu", None)
+            if acquire_mtu is not None:
+                try:
+                    await acquire_mtu()
+                except Exception:
+                    pass
+            self.mtu_payload = self.client.mtu_size - 3
+            self.bt_log_widget.write(f"[dim]MTU: {self.client.mtu_size}[/]")
+            # Fall back to acknowledged writes if RX doesn't advertise Write Command
+            rx_char = self.client.services.get_characteristic(RX_UUID)
+            self.require_response = (
+                rx_char is None or "write-without-response" not in rx_char.properties
+            )
             await self.client.start_notify(TX_UUID, self.notification_handler)
             
             self.bt_connected = True
@@ -227,94 +470,167 @@ class ESP32Terminal(App):
             return True
             
         except Exception as e:
-            self.bt_log_widget.write(f"[red]❌ Connection failed: {e}[/]")
+            if not quiet:
+                self.bt_log_widget.write(f"[red]❌ Connection failed: {escape(str(e))}[/]")
+            # Setup may have failed after connect(); don't leave the link up
+            # while a fallback connects a second client to the same device
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+            self.client = None
             return False
     
-    def start_serial_monitor(self):
-        """Start platformio serial monitor - run in separate thread pool"""
+    async def start_serial_monitor(self):
+        """Open the ESP32's USB serial port and read it on the event loop
+        
+        The port is opened directly rather than through `platformio device
+        monitor`: that needs an interactive TTY on stdin, and sharing
+        Textual's TTY would split keystrokes between the app and the device.
+        The fd is watched with loop.add_reader, so there is no reader thread.
+        """
+        if serial is None:
+            self.serial_log_widget.write(Text.from_markup("[red]❌ pyserial not found. Install it first.[/]"))
+            return False
+        
+        port = self.serial_port or _find_serial_port()
+        if not port:
+            self.serial_log_widget.write(Text.from_markup("[red]❌ No ESP32 serial port found.[/]"))
+            return False
+        
         try:
-            self.serial_log_widget.write("[yellow]Starting platformio serial monitor...[/]")
+            self.serial_log_widget.write(Text(f"Opening {port}...", style="yellow"))
             
-            # Use regular subprocess (not async) and read in thread pool executor
-            self.serial_process = subprocess.Popen(
-                ['platformio', 'device', 'monitor', '--baud', '115200'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                bufsize=0  # Unbuffered
-            )
+            self.serial_conn = serial.Serial(port, DEFAULT_BAUD_RATE, timeout=0)
+            self.loop.add_reader(self.serial_conn.fileno(), self._on_serial_readable)
             
             self.serial_connected = True
-            self.serial_log_widget.write("[green bold]✓ Serial monitor started![/]")
-            
-            # Read in a completely separate thread using ThreadPoolExecutor
-            # This keeps it off the main event loop entirely
-            import concurrent.futures
-            self.serial_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-            self.serial_executor.submit(self.read_serial_in_thread)
+            self.serial_log_widget.write(Text.from_markup("[green bold]✓ Serial monitor started![/]"))
             
             return True
-        except FileNotFoundError:
-            self.serial_log_widget.write("[red]❌ platformio not found. Install it first.[/]")
-            return False
         except Exception as e:
-            self.serial_log_widget.write(f"[red]❌ Failed to start serial monitor: {e}[/]")
+            self._close_serial()
+            self.serial_log_widget.write(Text(f"❌ Failed to start serial monitor: {e}", style="red"))
             return False
     
-    def read_serial_in_thread(self):
-        """Read serial in dedicated thread - completely isolated from event loop"""
-        while self.running and self.serial_connected and self.serial_process:
-            try:
-                line = self.serial_process.stdout.readline()
-                if line:
-                    message = line.decode('utf-8', errors='ignore').rstrip('\n\r')
-                    if message and not message.startswith('---'):
-                        timestamp = datetime.now().strftime("%H:%M:%S")
-                        # Use call_from_thread to safely communicate with Textual
-                        try:
-                            self.call_from_thread(
-                                self.serial_message_queue.put_nowait,
-                                f"[dim]{timestamp}[/] {message}"
-                            )
-                        except:
-                            pass  # Queue full, drop message
-                else:
-                    self.serial_connected = False
-                    break
-            except Exception:
-                pass
+    def _on_serial_readable(self):
+        """Read whatever the port has buffered and queue complete lines"""
+        try:
+            data = self.serial_conn.read(self.serial_conn.in_waiting or 1)
+        except Exception as e:
+            # Typically the board was unplugged or reset over USB
+            self._close_serial()
+            self.serial_log_widget.write(Text(f"❌ Serial disconnected: {e}", style="red"))
+            return
+        if not data:
+            return
+        lines = (self._serial_tail + data).split(b'\n')
+        self._serial_tail = lines.pop()  # keep the partial last line for next read
+        if not lines:
+            return
+        for message in b'\n'.join(lines).decode('utf-8', errors='ignore').split('\n'):
+            message = message.rstrip('\r')
+            if message:
+                self.serial_buf.append(message)
+        self._serial_evt.set()
+    
+    def _close_serial(self):
+        """Stop watching and close the serial port"""
+        self.serial_connected = False
+        if self.serial_conn is None:
+            return
+        try:
+            self.loop.remove_reader(self.serial_conn.fileno())
+        except Exception:
+            pass
+        self.serial_conn.close()
+        self.serial_conn = None
     
-    async def send_command(self, command):
-        """Send command to ESP32 via Bluetooth"""
+    async def send_command(self, command, response=None):
+        """Send command to ESP32 via Bluetooth
+        
+        Pass response=True to wait for the ATT write acknowledgement;
+        by default self.require_response decides.
+        """
         if not self.bt_connected or not self.client:
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = self._ts()
             self.bt_log_widget.write(f"[dim]{timestamp}[/] [red]Not connected![/]")
             return False
         
-        try:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.bt_log_widget.write(f"[dim]{timestamp}[/] [green]> {command}[/]")
-            await self.client.write_gatt_char(RX_UUID, command.encode('utf-8'))
-            
-            # Don't wait for response - let it come asynchronously
-            # The notification handler will display the response
-            
-            return True
-        except Exception as e:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.bt_log_widget.write(f"[dim]{timestamp}[/] [red]Error: {e}[/]")
-            return False
+        async with self._send_lock:
+            try:
+                # Render device lines that arrived before this command (and
+                # any pending repeat count) so the echo lands after them,
+                # even while the typing hold is delaying the drain
+                self._bt_repeat_due = True
+                self.render_bt_buffer()
+                self._last_bt_line = None
+                self.bt_log_widget.write(self._prefix() + f"[green]> {escape(command)}[/]")
+                key = command.strip().upper()
+                entry = _CMD_TABLE.get(key)
+                if entry:
+                    payload, timeout = entry
+                else:
+                    payload, timeout = command.encode('utf-8'), _response_timeout(key)
+                if response is None:
+                    # Write Command can't exceed one PDU. The firmware treats each
+                    # write as a whole command, so oversize payloads go out as one
+                    # acknowledged long write rather than chunks.
+                    response = self.require_response or len(payload) > self.mtu_payload
+                self._resp_event.clear()
+                self._awaiting_reply = True
+                await self.client.write_gatt_char(RX_UUID, payload, response=response)
+                
+                # Hold the next command until this one's reply starts arriving
+                # (or the timeout passes) so replies don't interleave
+                try:
+                    await asyncio.wait_for(self._resp_event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                
+                return True
+            except Exception as e:
+                timestamp = self._ts()
+                self.bt_log_widget.write(f"[dim]{timestamp}[/] [red]Error: {escape(str(e))}[/]")
+                return False
+            finally:
+                self._awaiting_reply = False
     
     def on_input_changed(self, event: Input.Changed) -> None:
         """Track when user is typing"""
-        import time
-        self.last_input_time = time.time()
+        # Clearing the input on submit also fires Changed; that isn't typing
+        if event.value:
+            self.last_input_time = time.monotonic()
+            # Freeze scrolling so log writes don't re-layout under the cursor
+            self.user_typing = True
+            self.bt_log_widget.auto_scroll = False
+            self.serial_log_widget.auto_scroll = False
+        else:
+            self._resume_auto_scroll()
+    
+    def _check_idle_scroll(self) -> None:
+        """Resume auto-scroll once the user has stopped typing for a while"""
+        if self.user_typing and time.monotonic() - self.last_input_time > TYPING_IDLE_SECONDS:
+            self._resume_auto_scroll()
+    
+    def _resume_auto_scroll(self) -> None:
+        """Re-enable auto-scroll and jump both logs to their latest lines"""
+        self.user_typing = False
+        for widget in (self.bt_log_widget, self.serial_log_widget):
+            if not widget.auto_scroll:
+                widget.auto_scroll = True
+                widget.scroll_end(animate=False)
     
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """Handle command submission"""
         command = event.value.strip()
         self.input_widget.value = ""
+        self._resume_auto_scroll()
+        # Enter ends the typing burst; let the reply render as soon as it lands
+        self.last_input_time = 0
+        self._typing_ended.set()
         
-        if command.lower() in ['quit', 'exit', 'q']:
+        if command.lower() in _QUIT:
             self.exit()
             return
         
@@ -330,13 +646,8 @@ class ESP32Terminal(App):
             await self.client.disconnect()
             self.bt_connected = False
         
-        if self.serial_process and self.serial_connected:
-            self.serial_process.terminate()
-            try:
-                await asyncio.wait_for(self.serial_process.wait(), timeout=2)
-            except asyncio.TimeoutError:
-                self.serial_process.kill()
-            self.serial_connected = False
+        if self.serial_conn:
+            self._close_serial()
     
 
     
@@ -345,9 +656,14 @@ class ESP32Terminal(App):
 def main():
     # Get device name from command line argument or use default
     device_name = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DEVICE_NAME
+    serial_port = sys.argv[2] if len(sys.argv) > 2 else None
+    
+    # Use uvloop when available; App.run() picks it up via the loop policy
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     
     # Create and run the app
-    app = ESP32Terminal(device_name)
+    app = ESP32Terminal(device_name, serial_port)
     app.title = "ESP32 Terminal"
     app.sub_title = f"Device: {device_name}"
     app.run()